@@ -6,31 +6,42 @@ all decisions and execution to LangGraph.
 """
 
 import asyncio
+import functools
+import hashlib
 import os
+import re
 import sys
-from typing import Optional
+from dataclasses import dataclass
+from typing import Callable, Optional
 
+import httpx
 from dotenv import load_dotenv
 from loguru import logger
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from pipecat.audio.vad.silero import SileroVADAnalyzer
-from pipecat.frames.frames import LLMMessagesFrame, EndFrame, TextFrame
+from pipecat.frames.frames import Frame, EndFrame, TextFrame, TTSSpeakFrame
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
 from pipecat.pipeline.task import PipelineParams, PipelineTask
-from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
+from pipecat.processors.aggregators.openai_llm_context import (
+    OpenAILLMContext,
+    OpenAILLMContextFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 from pipecat.serializers.twilio import TwilioFrameSerializer
-from pipecat.services.cartesia.tts import CartesiaTTSService
 from pipecat.services.deepgram.stt import DeepgramSTTService, LiveOptions
 from pipecat.services.openai.llm import OpenAILLMService
 from pipecat.services.openai.tts import OpenAITTSService
+from pipecat.services.tts_service import TTSService
 from pipecat.transports.network.fastapi_websocket import (
     FastAPIWebsocketTransport,
     FastAPIWebsocketParams,
 )
 
 from case_extraction import extract_case_number
-from graph import run_graph
+from graph import ESCALATION_PHRASES, ESCALATION_WORDS, get_intent_llm, run_graph
 from prompts import INTENT_EXTRACTION_PROMPT
+from tools import warm_up_twilio_client
 
 load_dotenv()
 
@@ -42,12 +53,174 @@ DEFAULT_COMPANY_NAME = os.getenv("COMPANY_NAME", "our company")
 CARTESIA_MODEL = os.getenv("CARTESIA_MODEL", "sonic-3")
 CARTESIA_VOICE_ID = os.getenv("CARTESIA_WELCOME_VOICE_ID", "sonic-3")
 OPENAI_TTS_VOICE = os.getenv("OPENAI_TTS_VOICE", "alloy")  # Options: alloy, echo, fable, onyx, nova, shimmer
+DEEPGRAM_API_KEY = os.getenv("DEEPGRAM_API_KEY")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+CARTESIA_API_KEY = os.getenv("CARTESIA_API_KEY")
+
+# Escalation words and phrases (shared with graph.py's keyword fast path) allow re-routing
+# to LangGraph after the inquiry was processed. Matched against whole words, so "agentic"
+# or "transferred" don't count.
+WORD_RE = re.compile(r"[a-z]+")
+# Any single escalation word as a whole token; the lookarounds match WORD_RE's token edges
+ESCALATION_WORD_RE = re.compile(
+    r"(?<![a-z])(?:" + "|".join(sorted(ESCALATION_WORDS)) + r")(?![a-z])"
+)
+
+# Once a call's history passes MAX_HISTORY_MESSAGES, the oldest turns are dropped so only
+# the system prompt and the last KEPT_HISTORY_MESSAGES remain. Trimming in large steps
+# keeps the cached prompt prefix stable between trims.
+MAX_HISTORY_MESSAGES = 40
+KEPT_HISTORY_MESSAGES = 20
+
+# A reply that is nothing but a numeric case number ("12345.", "case number 12345"),
+# i.e. a direct answer to the greeting, is taken as-is without the full extractor.
+BARE_CASE_NUMBER_RE = re.compile(
+    r"\s*(?:case\s*(?:number\s*)?#?\s*)?(\d{4,10})[.!?]?\s*",
+    re.IGNORECASE,
+)
+
+
+@dataclass(slots=True)
+class ConversationState:
+    """Per-call conversation state tracked for LangGraph routing."""
+    case_number: Optional[str] = None
+    case_number_collected: bool = False
+    inquiry_processed: bool = False
+    call_sid: Optional[str] = None
+    escalated: bool = False
+    case_number_extracted_after_inquiry: bool = False  # Track if we already re-ran LangGraph after extracting case number
+    last_processed_user_idx: int = -1  # Index of the last user message we processed to avoid duplicates
+    system_msg_idx: int = 0  # The support agent system prompt is the first message by construction
+    last_extracted_text: Optional[str] = None  # Last user text the case number extractor found nothing in
+
+
+def has_escalation_keyword(text: str) -> bool:
+    """Check whether the text contains an escalation word or phrase."""
+    text = text.lower()
+    if ESCALATION_WORD_RE.search(text):
+        return True
+    tokens = set(WORD_RE.findall(text))
+    return any(phrase <= tokens for phrase in ESCALATION_PHRASES)
+
+
+def trim_history(messages: list, max_messages: int = MAX_HISTORY_MESSAGES, keep: int = KEPT_HISTORY_MESSAGES) -> bool:
+    """Drop the oldest turns in place once the history grows past max_messages.
+
+    The system prompt at index 0 is always kept. Returns True if anything was dropped.
+    """
+    if len(messages) <= max_messages:
+        return False
+    del messages[1:len(messages) - keep]
+    return True
+
+
+def record_assistant_turn(messages: list, text: str) -> bool:
+    """Append text spoken outside the bot LLM as an assistant turn, exactly once.
+
+    The assistant context aggregator only records text between LLMFullResponseStartFrame
+    and LLMFullResponseEndFrame, so responses queued directly as TextFrame/TTSSpeakFrame
+    reach the context through this function alone. A turn identical to the last message
+    is not appended again. Returns True if the turn was appended.
+    """
+    turn = {"role": "assistant", "content": text}
+    if messages and messages[-1] == turn:
+        return False
+    messages.append(turn)
+    return True
+
+
+@functools.lru_cache(maxsize=4)
+def get_shared_openai_client(api_key: Optional[str], base_url: Optional[str] = None) -> AsyncOpenAI:
+    """Get the process-wide OpenAI client for the given credentials.
+
+    Pipecat builds a new client (and httpx connection pool) for every LLM service,
+    so sharing one across calls keeps TLS connections to OpenAI warm.
+    """
+    return AsyncOpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        http_client=DefaultAsyncHttpxClient(
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=1000, keepalive_expiry=None)
+        ),
+    )
+
+
+class SharedClientOpenAILLMService(OpenAILLMService):
+    """OpenAI LLM service that reuses the shared OpenAI client across calls.
 
+    The service itself holds per-call pipeline state, so only the client is shared.
+    """
 
+    def create_client(self, api_key=None, base_url=None, **kwargs):
+        return get_shared_openai_client(api_key, base_url)
+
+
+class SharedClientOpenAITTSService(OpenAITTSService):
+    """OpenAI TTS service that reuses the shared OpenAI client across calls.
+
+    OpenAITTSService.__init__ builds its own AsyncOpenAI client (and httpx pool), so it
+    is not called: this repeats its setup for the pinned pipecat version, with the shared
+    client instead. tests/test_bot.py checks the attributes still match a stock instance.
+    """
+
+    def __init__(
+        self,
+        *,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        voice: str = "alloy",
+        model: str = "gpt-4o-mini-tts",
+        sample_rate: Optional[int] = None,
+        instructions: Optional[str] = None,
+        **kwargs,
+    ):
+        TTSService.__init__(self, sample_rate=sample_rate, **kwargs)
+        self.set_model_name(model)
+        self.set_voice(voice)
+        self._instructions = instructions
+        self._client = get_shared_openai_client(api_key, base_url)
+
+
+class UserTurnNotifier(FrameProcessor):
+    """Signal an event each time the user aggregator commits a user turn.
+
+    Sits right after `context_aggregator.user()`, which pushes an
+    `OpenAILLMContextFrame` once the user's utterance has been added to the context.
+    The latest user text and turn count are captured here so consumers never
+    have to rescan the conversation history.
+
+    The event plus single text slot act as a latest-wins mailbox of size one: turns
+    that land while the consumer is busy overwrite each other instead of piling up.
+    """
+
+    def __init__(self, event: asyncio.Event, **kwargs):
+        super().__init__(**kwargs)
+        self._event = event
+        self.latest_user_text: Optional[str] = None
+        self.user_turn_count = 0
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, OpenAILLMContextFrame) and direction == FrameDirection.DOWNSTREAM:
+            # The aggregator appends the user message last, so this stops at the first item
+            for message in reversed(frame.context.get_messages()):
+                if message.get("role") == "user":
+                    self.latest_user_text = message.get("content")
+                    self.user_turn_count += 1
+                    self._event.set()
+                    break
+        await self.push_frame(frame, direction)
+
+
+@functools.lru_cache(maxsize=32)
 def build_system_prompt(company_name: str) -> str:
-    """Build the system prompt for the customer support agent."""
+    """Build the system prompt for the customer support agent.
+    
+    The company name goes last so that every deployment shares the same static
+    prefix, which is the part OpenAI's prompt cache can reuse.
+    """
     return f"""
-You are a helpful customer support agent for {company_name}. Your role is to assist customers with:
+You are a helpful customer support agent. Your role is to assist customers with:
 
 1. **Case Status Inquiries**: Help customers check the status of their support cases. You will need their case number to look up the status.
 
@@ -63,13 +236,88 @@ When a customer provides their case number, acknowledge it and let them know you
 IMPORTANT: For escalation requests, be silent or very brief - the system handles it automatically.
 
 Respond in the same language the caller uses.
+
+You are the customer support agent for {company_name}.
 """.strip()
 
 
+ESCALATED_PROMPT_SUFFIX = (
+    "\n\nCRITICAL: The call has been escalated. Do not generate any responses. Be completely silent."
+)
+
+
+@functools.lru_cache(maxsize=32)
+def build_escalated_system_prompt(company_name: str) -> str:
+    """Build the system prompt used once the call has been escalated."""
+    return build_system_prompt(company_name) + ESCALATED_PROMPT_SUFFIX
+
+
+DEFAULT_SYSTEM_PROMPT = build_system_prompt(DEFAULT_COMPANY_NAME)
+
+
+@functools.lru_cache(maxsize=32)
+def get_prompt_cache_key(system_prompt: str) -> str:
+    """Build the OpenAI prompt_cache_key for a system prompt.
+
+    OpenAI routes requests with the same key to the same prompt cache, so calls that
+    share a system prompt keep hitting the cached prefix. Cached prefixes are evicted
+    after roughly 5-10 minutes without traffic.
+    """
+    return "support-agent-" + hashlib.sha256(system_prompt.encode()).hexdigest()[:16]
+
+
+def choose_tts_factory() -> Optional[Callable[[], TTSService]]:
+    """Pick the TTS provider from configuration: OpenAI as primary, Cartesia as backup.
+
+    Returns a zero-argument callable that builds a fresh per-call TTS service,
+    or None if neither provider is configured.
+    """
+    if OPENAI_API_KEY:
+        logger.info(f"OpenAI TTS enabled as primary (voice: {OPENAI_TTS_VOICE}).")
+        return functools.partial(SharedClientOpenAITTSService, api_key=OPENAI_API_KEY, voice=OPENAI_TTS_VOICE)
+    
+    if CARTESIA_API_KEY and CARTESIA_VOICE_ID:
+        # Imported only when selected: it pulls in the Cartesia SDK and websockets,
+        # which workers using OpenAI TTS never need
+        from pipecat.services.cartesia.tts import CartesiaTTSService
+        
+        logger.info("Cartesia TTS enabled as backup.")
+        return functools.partial(
+            CartesiaTTSService,
+            api_key=CARTESIA_API_KEY,
+            voice_id=CARTESIA_VOICE_ID,
+            model=CARTESIA_MODEL,
+        )
+    
+    logger.warning("Cartesia TTS not configured; CARTESIA_API_KEY and CARTESIA_WELCOME_VOICE_ID required.")
+    return None
+
+
+TTS_FACTORY = choose_tts_factory()
+
+
+def warm_up() -> None:
+    """Load per-process resources before the first call arrives.
+
+    Called once at server startup, so the first caller doesn't wait for the intent
+    LLM (whose import graph.py defers) to be built, and the first escalation doesn't
+    wait for the Twilio SDK import.
+    """
+    try:
+        get_intent_llm()
+    except Exception as e:
+        logger.warning(f"Could not warm up the intent LLM: {e}")
+    warm_up_twilio_client()
+    logger.info("Warm-up complete")
+
+
 async def main(websocket_client, stream_sid: str, call_sid: Optional[str] = None, company_name: Optional[str] = None):
     """Main entry point for the voice pipeline."""
-    company_name = company_name or os.getenv("COMPANY_NAME") or DEFAULT_COMPANY_NAME
-    system_prompt = build_system_prompt(company_name)
+    company_name = company_name or DEFAULT_COMPANY_NAME
+    if company_name == DEFAULT_COMPANY_NAME:
+        system_prompt = DEFAULT_SYSTEM_PROMPT
+    else:
+        system_prompt = build_system_prompt(company_name)
 
     # Transport setup - using FastAPIWebsocketTransport like the working example
     transport = FastAPIWebsocketTransport(
@@ -84,74 +332,45 @@ async def main(websocket_client, stream_sid: str, call_sid: Optional[str] = None
         ),
     )
     
-    # Initialize services
-    deepgram_api_key = os.getenv("DEEPGRAM_API_KEY")
-    if not deepgram_api_key:
+    # Initialize services - keys and TTS provider are resolved once at import
+    if not DEEPGRAM_API_KEY:
         raise ValueError("DEEPGRAM_API_KEY must be set")
     
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    if not openai_api_key:
+    if not OPENAI_API_KEY:
         raise ValueError("OPENAI_API_KEY must be set")
     
     # STT Service
     stt = DeepgramSTTService(
-        api_key=deepgram_api_key,
+        api_key=DEEPGRAM_API_KEY,
         live_options=LiveOptions(
             model="nova-3",
             language="en-US",
         ),
     )
 
-    # LLM Service
-    llm = OpenAILLMService(
+    # LLM Service - the OpenAI client is shared across calls. Frame processors, the VAD
+    # analyzer and the serializer keep per-stream state, so they stay per-call.
+    llm = SharedClientOpenAILLMService(
         name="LLM",
-        api_key=openai_api_key,
+        api_key=OPENAI_API_KEY,
         model="gpt-4o-mini",
+        # Sent as extra_body: the openai SDK pinned by pipecat predates the prompt_cache_key argument
+        params=OpenAILLMService.InputParams(
+            extra={"extra_body": {"prompt_cache_key": get_prompt_cache_key(system_prompt)}}
+        ),
     )
     
     # TTS Service - OpenAI as primary, Cartesia as backup
-    openai_tts: OpenAITTSService | None = None
-    cartesia_tts: CartesiaTTSService | None = None
-    
-    # Try OpenAI TTS first (primary)
-    try:
-        openai_tts = OpenAITTSService(
-            api_key=openai_api_key,
-            voice=OPENAI_TTS_VOICE,
-        )
-        logger.info(f"OpenAI TTS enabled as primary (voice: {OPENAI_TTS_VOICE}).")
-    except Exception as exc:
-        logger.warning(f"Failed to initialize OpenAI TTS: {exc}, will try Cartesia as backup")
-        openai_tts = None
-    
-    # Try Cartesia TTS as backup if OpenAI failed
-    if not openai_tts:
-        cartesia_api_key = os.getenv("CARTESIA_API_KEY")
-        cartesia_voice_id = CARTESIA_VOICE_ID
-        
-        if cartesia_api_key and cartesia_voice_id:
-            try:
-                cartesia_tts = CartesiaTTSService(
-                    api_key=cartesia_api_key,
-                    voice_id=cartesia_voice_id,
-                    model=CARTESIA_MODEL,
-                )
-                logger.info("Cartesia TTS enabled as backup.")
-            except Exception as exc:
-                logger.error(f"Failed to initialize Cartesia TTS: {exc}")
-                cartesia_tts = None
-        else:
-            logger.warning("Cartesia TTS not configured; CARTESIA_API_KEY and CARTESIA_WELCOME_VOICE_ID required.")
-    
-    # Use whichever TTS service is available
-    tts_service = openai_tts or cartesia_tts
-    if not tts_service:
+    if not TTS_FACTORY:
         raise RuntimeError(
             "No TTS service available. Configure OPENAI_API_KEY (for OpenAI TTS) or "
             "CARTESIA_API_KEY and CARTESIA_WELCOME_VOICE_ID (for Cartesia TTS)."
         )
+    tts_service = TTS_FACTORY()
 
-    # Initialize conversation context
+    # Initialize conversation context. The system prompt stays first and the list is
+    # append-only (apart from the occasional trim_history), so every completion shares a
+    # byte-identical prefix; OpenAI caches prompt prefixes automatically once they reach 1024 tokens.
     messages = [
         {
             "role": "system",
@@ -163,16 +382,11 @@ async def main(websocket_client, stream_sid: str, call_sid: Optional[str] = None
     context_aggregator = llm.create_context_aggregator(context)
     
     # Track conversation state for LangGraph
-    conversation_state = {
-        "case_number": None,
-        "case_number_collected": False,
-        "inquiry_processed": False,
-        "call_sid": call_sid,
-        "escalated": False,
-        "case_number_extracted_after_inquiry": False,  # Track if we already re-ran LangGraph after extracting case number
-        "escalation_processed": False,  # Track if we've already processed an escalation request
-        "last_processed_message": None,  # Track the last message we processed to avoid duplicates
-    }
+    conversation_state = ConversationState(call_sid=call_sid)
+    
+    # Set by the pipeline whenever a new user turn lands in the context
+    new_user_msg = asyncio.Event()
+    user_turn_notifier = UserTurnNotifier(new_user_msg)
     
     # Create pipeline
     pipeline = Pipeline(
@@ -180,6 +394,7 @@ async def main(websocket_client, stream_sid: str, call_sid: Optional[str] = None
             transport.input(),  # Websocket input from Twilio
             stt,  # Speech-To-Text
             context_aggregator.user(),
+            user_turn_notifier,  # Wakes the LangGraph monitor
             llm,  # LLM
             tts_service,  # Text-To-Speech (OpenAI primary, Cartesia backup)
             transport.output(),  # Websocket output to Twilio
@@ -189,104 +404,130 @@ async def main(websocket_client, stream_sid: str, call_sid: Optional[str] = None
     
     task = PipelineTask(pipeline, params=PipelineParams(allow_interruptions=True))
     
-    def sync_context():
-        """Sync messages with context."""
-        try:
+    # OpenAILLMContext keeps the list it was given, so appends to `messages` are already
+    # visible to it. set_messages() would copy the whole history onto itself (`_messages[:]
+    # = messages`) on every sync, so it is only used if the context holds its own copy.
+    # Resolve this once per call.
+    if context.get_messages() is not messages and hasattr(context, "set_messages"):
+        def sync_context():
+            """Sync messages with context."""
             context.set_messages(messages)
-        except AttributeError:
-            # Some versions of OpenAILLMContext may not expose set_messages;
-            # in that case we rely on in-place list mutation of `messages`.
-            pass
+    else:
+        def sync_context():
+            """No-op: the context shares the `messages` list."""
     
     # Background task to monitor messages and route to LangGraph
     async def monitor_messages():
         """Monitor conversation and route to LangGraph for policy decisions."""
         logger.info("LangGraph monitoring task started")
+        state = conversation_state
         while True:
             try:
-                # Check more frequently to catch escalation requests quickly
-                await asyncio.sleep(0.5)
+                # Wait for the next user turn instead of polling the context
+                await new_user_msg.wait()
+                new_user_msg.clear()
                 
                 # If escalation has occurred, skip processing but keep loop running to maintain connection
-                if conversation_state.get("escalated"):
+                if state.escalated:
                     logger.debug("Escalation completed - skipping message processing but keeping connection open")
                     continue
                 
-                aggregated_messages = context.get_messages()
-                if not aggregated_messages:
-                    continue
-                
-                # Get latest user message
-                user_messages = [m["content"] for m in aggregated_messages if m.get("role") == "user"]
-                if not user_messages:
+                # Get latest user message, captured by the notifier when the turn landed.
+                # VAD false positives can land as whitespace-only turns; those are skipped here.
+                latest_user_text = (user_turn_notifier.latest_user_text or "").strip()
+                if not latest_user_text:
                     continue
                 
-                latest_user_text = user_messages[-1]
-                logger.debug(f"Monitoring latest user message: {latest_user_text}")
+                logger.debug("Monitoring latest user message: {}", latest_user_text)
                 
-                # Skip if we've already processed this exact message
-                if latest_user_text == conversation_state.get("last_processed_message"):
-                    logger.debug(f"Skipping already processed message: {latest_user_text}")
+                # Skip if we've already processed this message (repeated utterances are new messages)
+                latest_user_idx = user_turn_notifier.user_turn_count - 1
+                if latest_user_idx == state.last_processed_user_idx:
+                    logger.debug("Skipping already processed message: {}", latest_user_text)
                     continue
                 
-                conversation_state["last_processed_message"] = latest_user_text
+                skipped_turns = latest_user_idx - state.last_processed_user_idx - 1
+                if skipped_turns > 0:
+                    logger.debug("Skipped {} stale user turn(s) that arrived while LangGraph was busy", skipped_turns)
+                state.last_processed_user_idx = latest_user_idx
                 
-                # Extract case number if not already collected
-                if not conversation_state["case_number_collected"]:
-                    case_number = extract_case_number(latest_user_text)
-                    if case_number:
-                        conversation_state["case_number"] = case_number
-                        conversation_state["case_number_collected"] = True
-                        logger.info(f"Extracted case number: {case_number}")
+                # Keep memory and per-completion prompt size bounded on long calls
+                if trim_history(messages):
+                    sync_context()
+                    logger.debug("Trimmed conversation history to {} messages", len(messages))
+                
+                # Extract case number if not already collected. Extraction is deterministic, so a
+                # repeated utterance ("hello?", "are you there?") that yielded nothing is not re-scanned.
+                # It runs before the graph rather than alongside it: it takes microseconds and supplies
+                # the graph's case_number, so a provisional run without it would cost an extra LLM round trip.
+                if not state.case_number_collected and latest_user_text != state.last_extracted_text:
+                    bare_match = BARE_CASE_NUMBER_RE.fullmatch(latest_user_text)
+                    if bare_match:
+                        extracted_case_number = bare_match.group(1)
+                    else:
+                        extracted_case_number = extract_case_number(latest_user_text)
+                    if extracted_case_number:
+                        state.case_number = extracted_case_number
+                        state.case_number_collected = True
+                        logger.info("Extracted case number: {}", extracted_case_number)
+                    else:
+                        state.last_extracted_text = latest_user_text
+                case_number = state.case_number
+                inquiry_processed = state.inquiry_processed
                 
                 # If we just extracted a case number and inquiry was already processed (without case number),
                 # reset inquiry_processed to re-run LangGraph with the case number (only once)
-                if (conversation_state.get("case_number") and 
-                    conversation_state.get("inquiry_processed") and 
-                    not conversation_state.get("case_number_extracted_after_inquiry")):
+                if (case_number and
+                    inquiry_processed and
+                    not state.case_number_extracted_after_inquiry):
                     # Check if the previous LangGraph run was without a case number
                     # If so, re-run it now that we have the case number (only once)
                     logger.info("Case number extracted after initial inquiry - re-running LangGraph with case number")
-                    conversation_state["inquiry_processed"] = False
-                    conversation_state["case_number_extracted_after_inquiry"] = True
+                    inquiry_processed = state.inquiry_processed = False
+                    state.case_number_extracted_after_inquiry = True
                 
                 # Route to LangGraph for policy decisions
                 # LangGraph handles all decision-making including escalation detection
                 # Always process if inquiry not yet processed, OR if escalation is requested (even after previous inquiry)
-                should_process = not conversation_state["inquiry_processed"]
-                logger.debug(f"Should process inquiry: {should_process}, inquiry_processed: {conversation_state.get('inquiry_processed')}, escalated: {conversation_state.get('escalated')}")
+                should_process = not inquiry_processed
+                logger.opt(lazy=True).debug(
+                    "Should process inquiry: {}, inquiry_processed: {}, escalated: {}",
+                    lambda: should_process,
+                    lambda: inquiry_processed,
+                    lambda: state.escalated,
+                )
                 
                 # Also check if this might be an escalation request (even if inquiry was already processed)
-                if not should_process and not conversation_state.get("escalated"):
+                # (escalated is always False here, the top of the loop skips escalated calls)
+                if not should_process:
                     # Quick check for escalation keywords to allow re-processing for escalation
-                    escalation_keywords = [
-                        "escalate", "agent", "human", "representative", "speak to someone",
-                        "talk to a person", "transfer", "manager", "supervisor", "connect me", "connect"
-                    ]
-                    has_escalation_keyword = any(keyword in latest_user_text.lower() for keyword in escalation_keywords)
-                    logger.debug(f"Checking for escalation keywords in '{latest_user_text}': {has_escalation_keyword}")
-                    if has_escalation_keyword:
-                        logger.info(f"Escalation request detected in message: '{latest_user_text}' - routing to LangGraph even though inquiry was already processed")
+                    escalation_requested = has_escalation_keyword(latest_user_text)
+                    logger.debug("Checking for escalation keywords in '{}': {}", latest_user_text, escalation_requested)
+                    if escalation_requested:
+                        logger.info("Escalation request detected in message: '{}' - routing to LangGraph even though inquiry was already processed", latest_user_text)
                         should_process = True
                 
                 if should_process:
-                    logger.info(f"Processing message through LangGraph: '{latest_user_text}'")
+                    logger.info("Processing message through LangGraph: '{}'", latest_user_text)
                     try:
-                        # Run LangGraph with the user's inquiry - it will extract intent and make decisions
-                        result = run_graph(
+                        # Run LangGraph with the user's inquiry - it will extract intent and make decisions.
+                        # The graph is async end to end, so its LLM round trip doesn't block the event
+                        # loop that drives STT, TTS and the Twilio websocket.
+                        result = await run_graph(
                             user_input=latest_user_text,
-                            case_number=conversation_state.get("case_number"),
-                            call_sid=call_sid,
+                            case_number=case_number,
+                            call_sid=state.call_sid,
                         )
-                        logger.info(f"LangGraph result: escalated={result.get('escalated')}, intent={result.get('intent')}, response_text={result.get('response_text')}")
+                        intent = result.get("intent")
+                        escalated = result.get("escalated", False)
+                        response_text = result.get("response_text")
+                        logger.info("LangGraph result: escalated={}, intent={}, response_text={}", escalated, intent, response_text)
                         
                         # Only mark as processed if this wasn't an escalation request after a previous inquiry
-                        intent = result.get("intent")
-                        if intent != "escalate" or not conversation_state["inquiry_processed"]:
-                            conversation_state["inquiry_processed"] = True
+                        if intent != "escalate" or not inquiry_processed:
+                            state.inquiry_processed = True
                         
-                        escalated = result.get("escalated", False)
-                        conversation_state["escalated"] = escalated
+                        state.escalated = escalated
                         
                         # Handle escalation if LangGraph decided to escalate
                         if escalated:
@@ -301,10 +542,7 @@ async def main(websocket_client, stream_sid: str, call_sid: Optional[str] = None
                             messages.append(stop_message)
                             
                             # Update the main system prompt to prevent future responses
-                            for msg in messages:
-                                if msg.get("role") == "system" and "customer support agent" in msg.get("content", ""):
-                                    msg["content"] = f"{msg['content']}\n\nCRITICAL: The call has been escalated. Do not generate any responses. Be completely silent."
-                                    break
+                            messages[state.system_msg_idx]["content"] = build_escalated_system_prompt(company_name)
                             sync_context()
                             
                             # DO NOT try to speak the LangGraph response - the transfer TwiML already has a <Say> verb
@@ -319,9 +557,11 @@ async def main(websocket_client, stream_sid: str, call_sid: Optional[str] = None
                             continue
                         
                         # If LangGraph generated a response (non-escalation), inject it into the conversation
-                        response_text = result.get("response_text")
                         if response_text:
-                            logger.info(f"LangGraph response: {response_text}")
+                            logger.info("LangGraph response: {}", response_text)
+                            # Record it as an assistant turn so the bot LLM knows it was said
+                            if record_assistant_turn(messages, response_text):
+                                sync_context()
                             # Queue the response directly as a TextFrame to trigger TTS
                             await task.queue_frames([TextFrame(text=response_text)])
                             
@@ -334,44 +574,56 @@ async def main(websocket_client, stream_sid: str, call_sid: Optional[str] = None
                 break
             except Exception as e:
                 logger.error(f"Error in monitor_messages: {e}", exc_info=True)
-                await asyncio.sleep(2)
     
-    monitor_task = None
+    # Monitor task for this call; cancelled on disconnect and when main() exits
+    background_tasks: set[asyncio.Task] = set()
+
+    def start_background_task(coro) -> None:
+        """Run a coroutine as a background task tied to this call."""
+        background_task = asyncio.create_task(coro)
+        background_tasks.add(background_task)
+        background_task.add_done_callback(background_tasks.discard)
+
+    async def cancel_background_tasks() -> None:
+        """Cancel this call's background tasks and wait for them to finish."""
+        pending = list(background_tasks)
+        for background_task in pending:
+            background_task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
 
     @transport.event_handler("on_client_connected")
     async def on_client_connected(transport, client):
         """Handle client connection."""
-        nonlocal monitor_task
-        # Start monitoring task when client connects
-        monitor_task = asyncio.create_task(monitor_messages())
-        logger.info("LangGraph monitoring task created")
+        # Start the monitoring task when client connects, unless a previous
+        # connect event already did and no disconnect stopped it
+        if background_tasks:
+            logger.warning("Client connected while background tasks are still running - reusing them")
+        else:
+            start_background_task(monitor_messages())
+            logger.info("LangGraph monitoring task created")
         
-        # Kick off the conversation with greeting
-        opening_message = {
-            "role": "system", 
-            "content": (
-                f"Say: 'Hello! This is {company_name} customer support. "
-                "I can help you check your case status or escalate your case. "
-                "First, I'll need your case number. Please provide your case number.'"
-            ),
-        }
-        messages.append(opening_message)
-        sync_context()
-        await task.queue_frames([LLMMessagesFrame(list(messages))])
-        messages.pop()
-        sync_context()
+        # Kick off the conversation with greeting. It is spoken directly rather than
+        # generated by the LLM, and recorded as an assistant turn so the message list
+        # stays append-only behind the static system prompt. The assistant aggregator
+        # ignores it (it is not part of an LLM response), so it is stored once.
+        greeting = (
+            f"Hello! This is {company_name} customer support. "
+            "I can help you check your case status or escalate your case. "
+            "First, I'll need your case number. Please provide your case number."
+        )
+        if record_assistant_turn(messages, greeting):
+            sync_context()
+        await task.queue_frames([TTSSpeakFrame(text=greeting)])
 
     @transport.event_handler("on_client_disconnected")
     async def on_client_disconnected(transport, client):
         """Handle client disconnection."""
-        nonlocal monitor_task
-        if monitor_task:
-            monitor_task.cancel()
-            try:
-                await monitor_task
-            except asyncio.CancelledError:
-                pass
+        await cancel_background_tasks()
         await task.queue_frames([EndFrame()])
 
     runner = PipelineRunner(handle_sigint=False)
-    await runner.run(task)
+    try:
+        await runner.run(task)
+    finally:
+        # Make sure no task outlives the call, even if the disconnect event never fired
+        await cancel_background_tasks()
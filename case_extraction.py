@@ -12,28 +12,96 @@ from loguru import logger
 
 
 # Word to digit mapping for spoken numbers
-WORD_TO_DIGIT = {
+WORD_TO_DIGIT: dict[str, str] = {
     "zero": "0", "oh": "0", "o": "0",
     "one": "1", "two": "2", "three": "3", "four": "4",
     "five": "5", "six": "6", "seven": "7", "eight": "8", "nine": "9"
 }
 
-# Regex patterns for written case number formats
-WRITTEN_CASE_PATTERNS = [
-    r'\b[A-Z]{2,}-\d+\b',  # ABC-123
-    r'\bVIP-\d+\b',  # VIP-001 (with hyphen)
-    r'\bVIP\d+\b',  # VIP001 (without hyphen)
-    r'\b[A-Z]{2,}\d+\b',  # ABC123 (alphanumeric without hyphen)
-    # Note: r'\b\d{4,}\b' removed to avoid false positives (years, phone numbers)
-    # Pure numeric case numbers should be extracted via spoken patterns or context
-]
+# Regex pattern for written case number formats, matched against uppercased text:
+# ABC-123, ABC123, VIP-001, VIP001 ([A-Z]{2,} already covers the VIP prefix)
+# Note: r'\b\d{4,}\b' removed to avoid false positives (years, phone numbers)
+# Pure numeric case numbers should be extracted via spoken patterns or context
+WRITTEN_CASE_PATTERN = re.compile(r'\b[A-Z]{2,}-?\d+\b')
 
-# Patterns for extracting spoken case numbers
-SPOKEN_CASE_PATTERNS = [
-    r"case\s+number\s+is\s+([a-z\s]+)",
-    r"case\s+number\s+([a-z\s]+)",
-    r"number\s+is\s+([a-z\s]+)",
-]
+# Pattern for extracting spoken case numbers ("case number is", "case number", "number is")
+SPOKEN_CASE_PATTERN = re.compile(r"(?:case\s+number\s+is|case\s+number|number\s+is)\s+([a-z\s]+)")
+
+# Numeric case numbers with explicit context ("case number 12345", "my case is 12345")
+NUMERIC_CONTEXT_PATTERN = re.compile(
+    r'(?:case\s+number|case\s+is|number\s+is|it\s+is|it\'s)\s+(\d{4,10})\b'
+)
+
+# Spoken alphanumeric formats after a context keyword ("case number is v i p zero zero one")
+SPOKEN_CONTEXT_PATTERN = re.compile(
+    r'(?:case\s+number|case\s+is|number\s+is|it\s+is|it\'s)\s+([a-z\s]+)'
+)
+
+# Spoken VIP formats without context: optional letters, then "vip" and at least 2 number words/digits
+STANDALONE_VIP_PATTERN = re.compile(
+    r'\b((?:[a-z]\s+){0,4}(?:vip|v\s+i\s+p)\s+(?:zero|oh|o|one|two|three|four|five|six|seven|eight|nine|\d)(?:\s+(?:zero|oh|o|one|two|three|four|five|six|seven|eight|nine|\d)){1,})\b'
+)
+
+# Last resort: mixed digits and number words after explicit case number context
+MIXED_CONTEXT_PATTERN = re.compile(
+    r'(?:case\s+number|case\s+is|number\s+is|it\s+is|it\'s)\s+([a-z\s\d]+)'
+)
+
+# Whole digit runs and number words, scanned in one pass instead of split() + per-word lookups
+DIGIT_TOKEN_PATTERN = re.compile(r'\b(?:\d+|' + '|'.join(WORD_TO_DIGIT) + r')\b')
+VIP_PATTERN = re.compile(r'(VIP)(\d+)')
+
+# Every case number format has at least one digit or spoken digit word, so text
+# without either can skip all the extraction patterns below
+CASE_NUMBER_HINT_PATTERN = re.compile(r'\d|\b(?:' + '|'.join(WORD_TO_DIGIT) + r')\b')
+
+# Translation table that deletes ASCII digits, used to count digits without a Python loop
+STRIP_DIGITS = str.maketrans('', '', '0123456789')
+
+
+def _spoken_digits(text: str) -> str:
+    """Join the digit runs and number words in text into one digit string."""
+    tokens: list[str] = DIGIT_TOKEN_PATTERN.findall(text)
+    return "".join(WORD_TO_DIGIT.get(token, token) for token in tokens)
+
+
+def _assemble_case_number(words: list[str]) -> Optional[tuple[str, str]]:
+    """Assemble spoken words ("v i p zero zero one") into a case number.
+    
+    Returns:
+        A (case_number, format_label) pair, or None if the words don't form a case number
+    """
+    parts = []
+    for word in words:
+        if word in WORD_TO_DIGIT:
+            parts.append(WORD_TO_DIGIT[word])
+        elif word.isdigit():
+            parts.append(word)
+        elif word == "vip":
+            parts.append("VIP")
+        elif len(word) == 1 and word.isalpha():
+            # Single letter - convert to uppercase
+            parts.append(word.upper())
+    result = "".join(parts)
+    
+    # Check if result looks like a case number (it only holds digits and letters)
+    digit_count = len(result) - len(result.translate(STRIP_DIGITS))
+    has_digits = digit_count > 0
+    has_letters = digit_count < len(result)
+    
+    if not ((has_letters and has_digits) or digit_count >= 4):
+        return None
+    
+    # Format VIP cases: "VIP001" -> "VIP-001"
+    if result.startswith("VIP") and has_digits:
+        vip_match = VIP_PATTERN.match(result)
+        if vip_match:
+            return f"{vip_match.group(1)}-{vip_match.group(2)}", "spoken VIP format"
+        return None
+    
+    if digit_count >= 4:
+        return result, "spoken numeric format"
+    return result, "spoken alphanumeric format"
 
 
 def extract_case_number(user_text: str) -> Optional[str]:
@@ -58,146 +126,68 @@ def extract_case_number(user_text: str) -> Optional[str]:
     if not user_text:
         return None
     
+    user_text_lower = user_text.lower()
+    if not CASE_NUMBER_HINT_PATTERN.search(user_text_lower):
+        return None
+    user_text_upper = user_text.upper()
+    
     # First try regex patterns for written formats (alphanumeric with context)
-    for pattern in WRITTEN_CASE_PATTERNS:
-        match = re.search(pattern, user_text.upper())
-        if match:
-            case_number = match.group(0)
-            logger.info(f"Extracted case number (written format): {case_number}")
-            return case_number
+    match = WRITTEN_CASE_PATTERN.search(user_text_upper)
+    if match:
+        case_number = match.group(0)
+        logger.info("Extracted case number (written format): {}", case_number)
+        return case_number
     
     # Try to extract numeric case numbers with context (avoiding years/phone numbers)
     # Look for patterns like "case number 12345" or "my case is 12345"
-    numeric_with_context = re.search(
-        r'(?:case\s+number|case\s+is|number\s+is|it\s+is|it\'s)\s+(\d{4,10})\b',
-        user_text.lower()
-    )
+    numeric_with_context = NUMERIC_CONTEXT_PATTERN.search(user_text_lower)
     if numeric_with_context:
         case_number = numeric_with_context.group(1)
-        logger.info(f"Extracted case number (numeric with context): {case_number}")
+        logger.info("Extracted case number (numeric with context): {}", case_number)
         return case_number
     
     # Try to extract spoken formats, including letter-by-letter like "v i p zero zero one"
-    user_text_lower = user_text.lower()
-    
     # Handle spoken alphanumeric formats (letter-by-letter or word-based)
     # Look for patterns like: "v i p zero zero one", "vip zero zero one", etc.
     # First try with context keywords
-    context_patterns = [
-        r'(?:case\s+number|case\s+is|number\s+is|it\s+is|it\'s)\s+([a-z\s]+)',
-    ]
-    
-    for pattern in context_patterns:
-        match = re.search(pattern, user_text_lower)
-        if match:
-            words = match.group(1).strip().split()
-            result = ""
-            for word in words:
-                if word in WORD_TO_DIGIT:
-                    result += WORD_TO_DIGIT[word]
-                elif word.isdigit():
-                    result += word
-                elif word == "vip":
-                    result += "VIP"
-                elif len(word) == 1 and word.isalpha():
-                    # Single letter - convert to uppercase
-                    result += word.upper()
-            
-            # Check if result looks like a case number
-            has_letters = any(c.isalpha() for c in result)
-            has_digits = any(c.isdigit() for c in result)
-            digit_count = sum(1 for c in result if c.isdigit())
-            
-            if (has_letters and has_digits) or (digit_count >= 4):
-                # Format VIP cases: "VIP001" -> "VIP-001"
-                if result.upper().startswith("VIP") and digit_count > 0:
-                    # Extract VIP and digits, format as VIP-XXX
-                    vip_match = re.match(r'(VIP)(\d+)', result.upper())
-                    if vip_match:
-                        formatted = f"{vip_match.group(1)}-{vip_match.group(2)}"
-                        logger.info(f"Extracted case number (spoken VIP format): {formatted}")
-                        return formatted
-                elif digit_count >= 4:
-                    logger.info(f"Extracted case number (spoken numeric format): {result}")
-                    return result
-                elif has_letters and has_digits:
-                    logger.info(f"Extracted case number (spoken alphanumeric format): {result.upper()}")
-                    return result.upper()
+    match = SPOKEN_CONTEXT_PATTERN.search(user_text_lower)
+    if match:
+        assembled = _assemble_case_number(match.group(1).split())
+        if assembled:
+            case_number, label = assembled
+            logger.info("Extracted case number ({}): {}", label, case_number)
+            return case_number
     
     # Also try without context - look for patterns like "v i p zero zero one" or "vip zero zero one"
     # This pattern matches: optional letters (single or "vip"), then at least 2 number words/digits
-    standalone_pattern = r'\b((?:[a-z]\s+){0,4}(?:vip|v\s+i\s+p)\s+(?:zero|oh|o|one|two|three|four|five|six|seven|eight|nine|\d)(?:\s+(?:zero|oh|o|one|two|three|four|five|six|seven|eight|nine|\d)){1,})\b'
-    match = re.search(standalone_pattern, user_text_lower)
+    match = STANDALONE_VIP_PATTERN.search(user_text_lower)
     if match:
-        words = match.group(1).strip().split()
-        result = ""
-        for word in words:
-            if word in WORD_TO_DIGIT:
-                result += WORD_TO_DIGIT[word]
-            elif word.isdigit():
-                result += word
-            elif word == "vip":
-                result += "VIP"
-            elif len(word) == 1 and word.isalpha():
-                result += word.upper()
-        
-        has_letters = any(c.isalpha() for c in result)
-        has_digits = any(c.isdigit() for c in result)
-        digit_count = sum(1 for c in result if c.isdigit())
-        
-        if (has_letters and has_digits) or (digit_count >= 4):
-            if result.upper().startswith("VIP") and digit_count > 0:
-                vip_match = re.match(r'(VIP)(\d+)', result.upper())
-                if vip_match:
-                    formatted = f"{vip_match.group(1)}-{vip_match.group(2)}"
-                    logger.info(f"Extracted case number (spoken VIP format, no context): {formatted}")
-                    return formatted
-            elif digit_count >= 4:
-                logger.info(f"Extracted case number (spoken numeric format, no context): {result}")
-                return result
-            elif has_letters and has_digits:
-                logger.info(f"Extracted case number (spoken alphanumeric format, no context): {result.upper()}")
-                return result.upper()
+        assembled = _assemble_case_number(match.group(1).split())
+        if assembled:
+            case_number, label = assembled
+            logger.info("Extracted case number ({}, no context): {}", label, case_number)
+            return case_number
     
     # Fallback to original spoken number patterns (pure numeric)
-    for pattern in SPOKEN_CASE_PATTERNS:
-        match = re.search(pattern, user_text_lower)
-        if match:
-            words = match.group(1).strip().split()
-            digits = ""
-            for word in words:
-                if word in WORD_TO_DIGIT:
-                    digits += WORD_TO_DIGIT[word]
-                elif word.isdigit():
-                    digits += word
-            
-            if len(digits) >= 4:  # At least 4 digits for a case number
-                logger.info(f"Extracted case number (spoken format): {digits}")
-                return digits
+    match = SPOKEN_CASE_PATTERN.search(user_text_lower)
+    if match:
+        digits = _spoken_digits(match.group(1))
+        
+        if len(digits) >= 4:  # At least 4 digits for a case number
+            logger.info("Extracted case number (spoken format): {}", digits)
+            return digits
     
     # Last resort: Only extract if there's explicit case number context
     # This prevents false positives from random numbers in conversation
-    case_context_patterns = [
-        r'(?:case\s+number|case\s+is|number\s+is|it\s+is|it\'s)\s+([a-z\s\d]+)',
-    ]
-    
-    for pattern in case_context_patterns:
-        match = re.search(pattern, user_text_lower)
-        if match:
-            # Extract digits from the matched context
-            context_text = match.group(1).strip()
-            tokens = re.findall(r'\b(?:\d+|[a-z]+)\b', context_text)
-            digits = ""
-            for token in tokens:
-                if token.isdigit():
-                    digits += token
-                elif token in WORD_TO_DIGIT:
-                    digits += WORD_TO_DIGIT[token]
-            
-            # Only return if we have 4-10 digits (reasonable case number length)
-            if 4 <= len(digits) <= 10:
-                logger.info(f"Extracted case number (context-aware mixed format): {digits}")
-                return digits
+    match = MIXED_CONTEXT_PATTERN.search(user_text_lower)
+    if match:
+        # Extract digits from the matched context
+        digits = _spoken_digits(match.group(1))
+        
+        # Only return if we have 4-10 digits (reasonable case number length)
+        if 4 <= len(digits) <= 10:
+            logger.info("Extracted case number (context-aware mixed format): {}", digits)
+            return digits
     
     return None
 
@@ -4,12 +4,17 @@ This module implements the decision and execution plane using LangGraph.
 It enforces default-deny execution - tools are unreachable unless explicitly routed.
 """
 
-import json
+import asyncio
 import os
-from typing import Annotated, Literal, Optional, TypedDict
+import re
+import time
+from collections import OrderedDict
+from contextlib import aclosing
+from typing import Literal, Optional, TypedDict
 
-from langchain_openai import ChatOpenAI
-from langgraph.graph import END, StateGraph
+from dotenv import load_dotenv
+from langchain_core.runnables import Runnable
+from langgraph.graph import END, START, StateGraph
 from langsmith import traceable
 from loguru import logger
 
@@ -17,6 +22,14 @@ from policies import Decision, evaluate_policy, get_auth_level
 from prompts import INTENT_EXTRACTION_PROMPT
 from tools import forward_call_to_agent, get_case_status
 
+# graph.py is imported before the server calls load_dotenv(), so load it here too
+load_dotenv()
+
+# Escalation target, read once at import instead of on every escalation
+SUPPORT_PHONE_NUMBER = os.getenv("SUPPORT_PHONE_NUMBER")
+# Optional OpenAI service tier for intent extraction ("priority" trades cost for lower latency)
+INTENT_LLM_SERVICE_TIER = os.getenv("INTENT_LLM_SERVICE_TIER") or None
+
 
 class GraphState(TypedDict):
     """State for the LangGraph state machine."""
@@ -37,124 +50,294 @@ class GraphState(TypedDict):
     escalated: bool
 
 
-def extract_intent(state: GraphState) -> GraphState:
+# Escalation vocabulary, shared with bot.py's check for escalation requests after the
+# inquiry was processed: any single word, or all words of any phrase.
+ESCALATION_WORDS = frozenset({
+    "escalate", "agent", "agents", "human", "humans", "representative", "representatives",
+    "transfer", "manager", "supervisor", "connect", "operator",
+})
+ESCALATION_PHRASES = (
+    frozenset({"speak", "someone"}),
+    frozenset({"speak", "somebody"}),
+    frozenset({"talk", "someone"}),
+    frozenset({"talk", "somebody"}),
+    frozenset({"talk", "person"}),
+)
+
+# Keyword fast path for the read-only case_status intent. Utterances with a status keyword,
+# no escalation vocabulary and no negation are classified without the LLM. Escalation can
+# transfer the call, so it is never decided by keyword presence alone ("the agent said it
+# was fixed"); utterances with any escalation word, even one half of a phrase, go to the LLM.
+ESCALATE_INTENT_RE = re.compile(
+    r"\b(?:escalat\w*|"
+    + "|".join(sorted(ESCALATION_WORDS.union(*ESCALATION_PHRASES)))
+    + r")\b"
+)
+STATUS_INTENT_RE = re.compile(r"\b(?:status|updates?|progress)\b")
+NEGATION_RE = re.compile(r"\b(?:no|not|never)\b|n't\b|\bdont\b")
+
+
+def classify_intent_fast(user_input: str) -> Optional[str]:
+    """Classify unambiguous case status utterances by keyword; None means ask the LLM."""
+    text = user_input.lower()
+    if NEGATION_RE.search(text) or ESCALATE_INTENT_RE.search(text):
+        return None
+    if STATUS_INTENT_RE.search(text):
+        return "case_status"
+    return None
+
+
+# Intents already extracted for an utterance, keyed by normalize_utterance() (LRU)
+INTENT_CACHE_MAXSIZE = 4096
+_intent_cache: "OrderedDict[str, str]" = OrderedDict()
+PUNCTUATION_RE = re.compile(r"[^\w\s]")
+
+
+def normalize_utterance(text: str) -> str:
+    """Normalize an utterance for intent caching: lowercase, no punctuation, single spaces."""
+    return " ".join(PUNCTUATION_RE.sub(" ", text.lower()).split())
+
+
+# Valid intents, checked against every streamed partial result
+INTENTS = frozenset({"case_status", "escalate"})
+
+
+class IntentOutput(TypedDict):
+    """Intent extracted from the user's utterance."""
+    intent: Literal["case_status", "escalate"]
+
+
+# LLM attempts per utterance before giving up (which denies the turn)
+INTENT_LLM_ATTEMPTS = 2
+
+# Intent extraction LLM, shared across graph runs so its HTTP connection pool stays warm
+_intent_llm: Optional[Runnable] = None
+
+
+def get_intent_llm() -> Runnable:
+    """Get or create the intent extraction LLM.
+    
+    Uses OpenAI structured outputs, so responses always parse into IntentOutput.
+    """
+    global _intent_llm
+    if _intent_llm is None:
+        # Imported here: langchain_openai is slow to import and is only needed once an
+        # utterance misses both the keyword fast path and the intent cache
+        import httpx
+        from langchain_openai import ChatOpenAI
+        from openai import DefaultAsyncHttpxClient
+        
+        # The system prompt is a byte-identical module constant placed before the user turn;
+        # a fixed prompt_cache_key routes every extraction to the same OpenAI prompt cache.
+        _intent_llm = ChatOpenAI(
+            model="gpt-4.1-mini",
+            temperature=0,
+            service_tier=INTENT_LLM_SERVICE_TIER,
+            extra_body={"prompt_cache_key": "intent-extraction"},
+            # Turns on a call are often more than httpx's default 5s keep-alive apart, so idle
+            # connections are kept open rather than re-handshaking TLS on the next turn
+            http_async_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(max_keepalive_connections=100, max_connections=1000, keepalive_expiry=None)
+            ),
+        ).with_structured_output(IntentOutput, method="json_schema", strict=True)
+    return _intent_llm
+
+
+async def _extract_intent_llm(user_input: str, cache_key: str) -> Optional[str]:
+    """Ask the intent LLM for an utterance's intent and cache it if valid."""
+    llm = get_intent_llm()
+    
+    # Extract intent
+    messages = [
+        {"role": "system", "content": INTENT_EXTRACTION_PROMPT},
+        {"role": "user", "content": user_input}
+    ]
+    
+    # A failed extraction denies the turn and the caller has to repeat themselves, so
+    # transient API or output errors get retried within the same turn first
+    intent: Optional[str] = None
+    for attempt in range(1, INTENT_LLM_ATTEMPTS + 1):
+        try:
+            # Stream the structured output and stop as soon as the intent value is complete,
+            # without waiting for the closing tokens of the response
+            intent = None
+            async with aclosing(llm.astream(messages)) as partials:
+                async for partial in partials:
+                    intent = partial.get("intent")
+                    if intent in INTENTS:
+                        break
+            break
+        except Exception as e:
+            if attempt == INTENT_LLM_ATTEMPTS:
+                logger.error("Failed to extract intent: {}", e)
+                return None
+            logger.warning("Intent extraction attempt {} failed, retrying: {}", attempt, e)
+    
+    if intent in INTENTS:
+        _intent_cache[cache_key] = intent
+        if len(_intent_cache) > INTENT_CACHE_MAXSIZE:
+            _intent_cache.popitem(last=False)
+    return intent
+
+
+# LLM extractions in flight, keyed by normalize_utterance(). Concurrent calls saying the
+# same thing ("agent please") share one request instead of each paying for their own.
+# Distinct utterances are not batched: Chat Completions takes one conversation per request,
+# so llm.abatch() would still send one request each, just after a batching delay.
+_intent_inflight: "dict[str, asyncio.Task[Optional[str]]]" = {}
+
+
+def _forget_inflight(cache_key: str, task: "asyncio.Task[Optional[str]]") -> None:
+    """Drop a finished extraction from _intent_inflight, unless it was already replaced."""
+    if _intent_inflight.get(cache_key) is task:
+        del _intent_inflight[cache_key]
+
+
+async def extract_intent(state: GraphState) -> dict:
     """Extract intent from user input using LLM.
     
     LLM extracts intent only - no execution authority.
+    Like every node, it returns only the keys it updates; LangGraph merges them into the state.
     """
     user_input = state.get("user_input", "")
-    case_number = state.get("case_number")
     
     if not user_input:
-        return {**state, "intent": None}
+        return {"intent": None}
     
-    # Initialize LLM for intent extraction
-    llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0.1)
+    fast_intent = classify_intent_fast(user_input)
+    if fast_intent:
+        logger.info("Extracted intent: {} from input: {} (keyword match)", fast_intent, user_input)
+        return {"intent": fast_intent}
     
-    # Extract intent
-    messages = [
-        {"role": "system", "content": INTENT_EXTRACTION_PROMPT},
-        {"role": "user", "content": user_input}
-    ]
+    # Voice intents are highly repetitive ("agent please", "what's my case status"),
+    # so utterances we've classified before skip the LLM round trip
+    cache_key = normalize_utterance(user_input)
+    cached_intent = _intent_cache.get(cache_key)
+    if cached_intent:
+        _intent_cache.move_to_end(cache_key)
+        logger.info("Extracted intent: {} from input: {} (cached)", cached_intent, user_input)
+        return {"intent": cached_intent}
     
-    try:
-        response = llm.invoke(messages)
-        content = response.content.strip()
-        
-        # Parse JSON response
-        if content.startswith("```json"):
-            content = content.replace("```json", "").replace("```", "").strip()
-        elif content.startswith("```"):
-            content = content.replace("```", "").strip()
-        
-        intent_data = json.loads(content)
-        intent = intent_data.get("intent")
-        
-        logger.info(f"Extracted intent: {intent} from input: {user_input}")
-        return {**state, "intent": intent}
-        
-    except Exception as e:
-        logger.error(f"Failed to extract intent: {str(e)}")
-        return {**state, "intent": None}
+    task = _intent_inflight.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(_extract_intent_llm(user_input, cache_key))
+        _intent_inflight[cache_key] = task
+        task.add_done_callback(lambda done: _forget_inflight(cache_key, done))
+    else:
+        logger.debug("Joining in-flight intent extraction for: {}", user_input)
+    
+    # Shielded so one caller hanging up doesn't cancel the request other callers are awaiting
+    intent = await asyncio.shield(task)
+    logger.info("Extracted intent: {} from input: {}", intent, user_input)
+    return {"intent": intent}
+
+
+async def auth_lookup_node(state: GraphState) -> dict:
+    """Look up the auth level for the case number.
+    
+    Only depends on the case number, so it runs in parallel with extract_intent.
+    """
+    return {"auth_level": get_auth_level(state.get("case_number"))}
 
 
-def evaluate_policy_node(state: GraphState) -> GraphState:
+async def evaluate_policy_node(state: GraphState) -> dict:
     """Evaluate policy and determine decision."""
     intent = state.get("intent")
-    case_number = state.get("case_number")
+    auth_level = state.get("auth_level")
     
     if not intent:
         logger.warning("No intent available for policy evaluation")
-        return {**state, "decision": "deny"}
-    
-    # Get auth level
-    auth_level = get_auth_level(case_number)
+        return {"decision": "deny"}
     
     # Evaluate policy
     decision = evaluate_policy(intent, auth_level)
     
-    logger.info(f"Policy evaluation: intent={intent}, auth_level={auth_level}, decision={decision}")
+    logger.info("Policy evaluation: intent={}, auth_level={}, decision={}", intent, auth_level, decision)
     
-    return {
-        **state,
-        "auth_level": auth_level,
-        "decision": decision
-    }
+    return {"decision": decision}
+
+
+# Node to run for each allowing decision; anything else goes to deny_node
+DECISION_ROUTES: dict[Optional[Decision], Literal["status_node", "escalate_node"]] = {
+    "allow_status": "status_node",
+    "allow_escalate": "escalate_node",
+}
 
 
 def route_decision(state: GraphState) -> Literal["status_node", "escalate_node", "deny_node"]:
     """Route to appropriate node based on decision."""
-    decision = state.get("decision")
+    return DECISION_ROUTES.get(state.get("decision"), "deny_node")
+
+
+# Case statuses fetched recently, keyed by case number (LRU with a short TTL). Callers often
+# ask about the same case twice in a row ("what's my status?", "are you sure?"), while the
+# short TTL keeps real status changes visible.
+STATUS_CACHE_MAXSIZE = 1024
+STATUS_CACHE_TTL_SECONDS = 30.0
+_status_cache: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+
+
+def get_case_status_cached(case_number: str) -> dict:
+    """Get case status, reusing a lookup from the last STATUS_CACHE_TTL_SECONDS."""
+    now = time.monotonic()
+    entry = _status_cache.get(case_number)
+    if entry is not None and now - entry[0] < STATUS_CACHE_TTL_SECONDS:
+        _status_cache.move_to_end(case_number)
+        return entry[1]
     
-    if decision == "allow_status":
-        return "status_node"
-    elif decision == "allow_escalate":
-        return "escalate_node"
-    else:
-        return "deny_node"
+    case_status = get_case_status(case_number)
+    _status_cache[case_number] = (now, case_status)
+    _status_cache.move_to_end(case_number)
+    if len(_status_cache) > STATUS_CACHE_MAXSIZE:
+        _status_cache.popitem(last=False)
+    return case_status
 
 
-def status_node(state: GraphState) -> GraphState:
+async def status_node(state: GraphState) -> dict:
     """Handle case status lookup (read-only)."""
     case_number = state.get("case_number")
     
     if not case_number:
         return {
-            **state,
             "response_text": "I need a case number to look up the status. Please provide your case number."
         }
     
     try:
-        case_status = get_case_status(case_number)
+        # An in-memory lookup, so it runs inline; a real case-management call would need
+        # asyncio.to_thread (or an async client) like the Twilio call in escalate_node
+        case_status = get_case_status_cached(case_number)
         
         status = case_status.get("status", "unknown")
         reason = case_status.get("reason", "No reason available")
         
         response = f"Your case {case_number} is currently {status}. {reason}"
         
-        logger.info(f"Case status retrieved: {response}")
-        return {**state, "response_text": response}
+        logger.debug("Case status retrieved: {}", response)
+        return {"response_text": response}
         
     except Exception as e:
-        logger.error(f"Failed to get case status: {str(e)}")
+        logger.error("Failed to get case status: {}", e)
         return {
-            **state,
             "response_text": "I'm sorry, I couldn't retrieve the case status at this time. Please try again later."
         }
 
 
-def escalate_node(state: GraphState) -> GraphState:
-    """Handle call escalation (REAL SIDE EFFECT)."""
+async def escalate_node(state: GraphState) -> dict:
+    """Handle call escalation (REAL SIDE EFFECT).
+    
+    The transfer announcement is not spoken by the bot alongside the REST call: the
+    transfer TwiML opens with its own <Say>, and Twilio tears down the media stream as
+    soon as it applies that TwiML, which would cut off any bot speech mid-sentence.
+    """
     call_sid = state.get("call_sid")
-    support_phone_number = os.getenv("SUPPORT_PHONE_NUMBER")
+    support_phone_number = SUPPORT_PHONE_NUMBER
     auth_level = state.get("auth_level")
     
-    logger.info(f"Escalation approved by policy (auth_level={auth_level})")
+    logger.info("Escalation approved by policy (auth_level={})", auth_level)
     
     if not call_sid:
         logger.error("Cannot escalate: no call_sid in state")
         return {
-            **state,
             "response_text": "I'm sorry, I cannot escalate this call at this time.",
             "escalated": False
         }
@@ -162,39 +345,40 @@ def escalate_node(state: GraphState) -> GraphState:
     if not support_phone_number:
         logger.error("Cannot escalate: SUPPORT_PHONE_NUMBER not configured")
         return {
-            **state,
             "response_text": "I'm sorry, escalation is not available at this time.",
             "escalated": False
         }
     
     try:
-        success = forward_call_to_agent(call_sid, support_phone_number)
+        # The Twilio SDK is blocking, so the REST call runs in a worker thread
+        success = await asyncio.to_thread(forward_call_to_agent, call_sid, support_phone_number)
         
         if success:
-            logger.info(f"Call {call_sid} successfully escalated")
+            logger.info("Call {} successfully escalated", call_sid)
+            # The case is now with a human agent, so its cached status is about to go stale
+            case_number = state.get("case_number")
+            if case_number:
+                _status_cache.pop(case_number, None)
             return {
-                **state,
                 "response_text": "I'm transferring you to a human agent now.",
                 "escalated": True
             }
         else:
-            logger.error(f"Failed to escalate call {call_sid}")
+            logger.error("Failed to escalate call {}", call_sid)
             return {
-                **state,
                 "response_text": "I'm sorry, I couldn't transfer you to an agent. Please try again later.",
                 "escalated": False
             }
             
     except Exception as e:
-        logger.error(f"Exception during escalation: {str(e)}")
+        logger.error("Exception during escalation: {}", e)
         return {
-            **state,
             "response_text": "I'm sorry, an error occurred while trying to escalate your call.",
             "escalated": False
         }
 
 
-def deny_node(state: GraphState) -> GraphState:
+async def deny_node(state: GraphState) -> dict:
     """Handle denied requests."""
     intent = state.get("intent")
     
@@ -203,8 +387,8 @@ def deny_node(state: GraphState) -> GraphState:
     else:
         response = "I'm sorry, I cannot process that request."
     
-    logger.info(f"Request denied: {response}")
-    return {**state, "response_text": response}
+    logger.info("Request denied: {}", response)
+    return {"response_text": response}
 
 
 def create_graph() -> StateGraph:
@@ -213,16 +397,17 @@ def create_graph() -> StateGraph:
     
     # Add nodes
     workflow.add_node("extract_intent", extract_intent)
+    workflow.add_node("auth_lookup", auth_lookup_node)
     workflow.add_node("evaluate_policy", evaluate_policy_node)
     workflow.add_node("status_node", status_node)
     workflow.add_node("escalate_node", escalate_node)
     workflow.add_node("deny_node", deny_node)
     
-    # Set entry point
-    workflow.set_entry_point("extract_intent")
-    
-    # Add edges
-    workflow.add_edge("extract_intent", "evaluate_policy")
+    # Intent extraction and auth lookup are independent, so they fan out from the start
+    # and run concurrently; policy evaluation waits for both
+    workflow.add_edge(START, "extract_intent")
+    workflow.add_edge(START, "auth_lookup")
+    workflow.add_edge(["extract_intent", "auth_lookup"], "evaluate_policy")
     workflow.add_conditional_edges(
         "evaluate_policy",
         route_decision,
@@ -241,34 +426,31 @@ def create_graph() -> StateGraph:
     return workflow.compile()
 
 
-# Global graph instance
-_graph = None
+# Global graph instance, compiled at import so the first call doesn't pay for it
+_graph = create_graph()
 
 
 def get_graph():
-    """Get or create the LangGraph instance."""
-    global _graph
-    if _graph is None:
-        _graph = create_graph()
+    """Get the compiled LangGraph instance."""
     return _graph
 
 
-@traceable(name="policy_graph")
-def run_graph(user_input: str, case_number: Optional[str] = None, call_sid: Optional[str] = None) -> dict:
+async def run_graph(user_input: str, case_number: Optional[str] = None, call_sid: Optional[str] = None) -> GraphState:
     """Run the policy graph with given inputs.
     
+    Blank input (VAD false positives) returns right away with no response, skipping
+    the graph, its LLM call, and the LangSmith trace.
+    
     Args:
         user_input: The user's spoken input
         case_number: The case number (if collected)
         call_sid: The Twilio call SID
         
     Returns:
-        dict: Graph execution result with response_text and escalated flag
+        GraphState: Graph execution result with response_text and escalated flag
     """
-    graph = get_graph()
-    
     initial_state: GraphState = {
-        "user_input": user_input,
+        "user_input": user_input.strip(),
         "case_number": case_number,
         "call_sid": call_sid,
         "intent": None,
@@ -278,15 +460,25 @@ def run_graph(user_input: str, case_number: Optional[str] = None, call_sid: Opti
         "escalated": False
     }
     
+    if not initial_state["user_input"]:
+        return initial_state
+    
+    return await _invoke_graph(initial_state)
+
+
+@traceable(name="policy_graph")
+async def _invoke_graph(initial_state: GraphState) -> GraphState:
+    """Invoke the compiled graph, falling back to an apology if it fails."""
+    graph = get_graph()
+    
     try:
-        result = graph.invoke(initial_state)
-        logger.info(f"Graph execution completed: {result}")
+        result = await graph.ainvoke(initial_state)
+        logger.debug("Graph execution completed: {}", result)
         return result
     except Exception as e:
-        logger.error(f"Graph execution failed: {str(e)}")
+        logger.error("Graph execution failed: {}", e)
         return {
             **initial_state,
             "response_text": "I'm sorry, an error occurred while processing your request.",
             "escalated": False
         }
-
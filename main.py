@@ -7,7 +7,10 @@ This module provides:
 
 import json
 import os
+from contextlib import asynccontextmanager
+from string import Template
 from typing import Optional
+from xml.sax.saxutils import escape, quoteattr
 
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request, WebSocket
@@ -15,12 +18,62 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
 from loguru import logger
 
-from bot import main
+from bot import main, warm_up
 
 # Load environment variables from .env file
 load_dotenv()
 
-app = FastAPI(title="Policy-aware Voice AI Customer Support PoC")
+# Call-invariant configuration, read once at startup
+WEBSOCKET_URL = os.getenv("WEBSOCKET_URL")
+COMPANY_NAME = os.getenv("COMPANY_NAME", "our company")
+SUPPORT_PHONE_NUMBER = os.getenv("SUPPORT_PHONE_NUMBER")
+TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID")
+TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
+
+# Verify Twilio credentials are available (needed for escalation)
+if not TWILIO_ACCOUNT_SID or not TWILIO_AUTH_TOKEN:
+    logger.warning(f"TWILIO_ACCOUNT_SID or TWILIO_AUTH_TOKEN not set. Account SID: {'SET' if TWILIO_ACCOUNT_SID else 'NOT SET'}, Auth Token: {'SET' if TWILIO_AUTH_TOKEN else 'NOT SET'}")
+
+# TwiML responses, built once; only the stream URL and dialed number vary per call
+STREAM_TWIML = Template('''<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+  <Connect>
+    <Stream url=$url></Stream>
+  </Connect>
+  <Pause length="40"/>
+</Response>''')
+
+TRANSFER_TWIML = Template('''<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+  <Say voice="alice">Connecting you to one of our agents now. Please hold.</Say>
+  <Dial timeout="30" answerOnMedia="false" hangupOnStar="false" record="false">
+    <Number>$number</Number>
+  </Dial>
+  <Say voice="alice">I'm sorry, we couldn't connect you to an agent at this time. Please try again later.</Say>
+  <Hangup/>
+</Response>''')
+
+TRANSFER_UNAVAILABLE_TWIML = b'''<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+  <Say>I'm sorry, transfer is not available at this time.</Say>
+  <Hangup/>
+</Response>'''
+
+TRANSFER_ERROR_TWIML = b'''<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+  <Say>I'm sorry, an error occurred during transfer. Please try again later.</Say>
+  <Hangup/>
+</Response>'''
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up per-process resources before accepting calls."""
+    warm_up()
+    yield
+
+
+app = FastAPI(title="Policy-aware Voice AI Customer Support PoC", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -37,7 +90,7 @@ async def start_call(request: Request):
     logger.info("Received POST request for TwiML")
     
     # Use environment variable if set, otherwise construct from request
-    ws_url = os.getenv("WEBSOCKET_URL")
+    ws_url = WEBSOCKET_URL
     if not ws_url:
         forwarded_proto = request.headers.get("x-forwarded-proto")
         is_https = forwarded_proto == "https" or request.url.scheme == "https"
@@ -48,15 +101,9 @@ async def start_call(request: Request):
             host = "localhost:8000"
         ws_url = f"{scheme}://{host}/ws"
     
-    logger.info(f"Generated WebSocket URL: {ws_url}")
+    logger.info("Generated WebSocket URL: {}", ws_url)
     
-    xml_content = f'''<?xml version="1.0" encoding="UTF-8"?>
-<Response>
-  <Connect>
-    <Stream url="{ws_url}"></Stream>
-  </Connect>
-  <Pause length="40"/>
-</Response>'''
+    xml_content = STREAM_TWIML.substitute(url=quoteattr(ws_url))
     
     return HTMLResponse(content=xml_content, media_type="application/xml")
 
@@ -71,27 +118,19 @@ async def websocket_endpoint(websocket: WebSocket):
     try:
         # First message is usually empty or connection metadata
         first_message = await websocket.receive_text()
-        logger.debug(f"First WebSocket message: {first_message}")
+        logger.debug("First WebSocket message: {}", first_message)
         
         # Second message contains stream start data
         start_message = await websocket.receive_text()
-        call_data = json.loads(start_message)
-        
-        stream_sid = call_data.get("start", {}).get("streamSid")
-        call_sid = call_data.get("start", {}).get("callSid")
-        
-        logger.info(f"Starting voice AI session with stream_sid: {stream_sid}, call_sid: {call_sid}")
+        start_data = json.loads(start_message).get("start", {})
         
-        # Verify Twilio credentials are available
-        account_sid = os.getenv("TWILIO_ACCOUNT_SID")
-        auth_token = os.getenv("TWILIO_AUTH_TOKEN")
-        if not account_sid or not auth_token:
-            logger.warning(f"TWILIO_ACCOUNT_SID or TWILIO_AUTH_TOKEN not set. Account SID: {'SET' if account_sid else 'NOT SET'}, Auth Token: {'SET' if auth_token else 'NOT SET'}")
+        stream_sid = start_data.get("streamSid")
+        call_sid = start_data.get("callSid")
         
-        company_name = os.getenv("COMPANY_NAME", "our company")
+        logger.info("Starting voice AI session with stream_sid: {}, call_sid: {}", stream_sid, call_sid)
         
         # Start the Pipecat pipeline
-        await main(websocket, stream_sid, call_sid, company_name=company_name)
+        await main(websocket, stream_sid, call_sid, company_name=COMPANY_NAME)
         
     except Exception as e:
         logger.error(f"Error in WebSocket endpoint: {str(e)}", exc_info=True)
@@ -103,48 +142,32 @@ async def transfer_call(request: Request):
     """TwiML endpoint for call transfer to human agent."""
     try:
         # Get phone number from query parameter or environment variable
-        support_phone_number = request.query_params.get("number") or os.getenv("SUPPORT_PHONE_NUMBER")
+        number_param = request.query_params.get("number")
+        support_phone_number = number_param or SUPPORT_PHONE_NUMBER
         
         # Log the request for debugging
-        logger.info(f"Transfer endpoint called - number param: {request.query_params.get('number')}, env number: {os.getenv('SUPPORT_PHONE_NUMBER')}")
+        logger.info("Transfer endpoint called - number param: {}, env number: {}", number_param, SUPPORT_PHONE_NUMBER)
         
         if not support_phone_number:
             logger.error("SUPPORT_PHONE_NUMBER not configured for transfer")
-            xml_content = '''<?xml version="1.0" encoding="UTF-8"?>
-<Response>
-  <Say>I'm sorry, transfer is not available at this time.</Say>
-  <Hangup/>
-</Response>'''
+            xml_content = TRANSFER_UNAVAILABLE_TWIML
         else:
             # Normalize and escape the phone number for TwiML
             from tools import normalize_phone_number
             normalized_number = normalize_phone_number(support_phone_number)
-            logger.info(f"Transferring call to {normalized_number} (normalized from {support_phone_number})")
+            logger.info("Transferring call to {} (normalized from {})", normalized_number, support_phone_number)
             
             # Use Dial with proper attributes for call transfer
             # If Dial fails (no answer, busy, etc.), Twilio will continue to next verb
-            xml_content = f'''<?xml version="1.0" encoding="UTF-8"?>
-<Response>
-  <Say voice="alice">Connecting you to one of our agents now. Please hold.</Say>
-  <Dial timeout="30" answerOnMedia="false" hangupOnStar="false" record="false">
-    <Number>{normalized_number}</Number>
-  </Dial>
-  <Say voice="alice">I'm sorry, we couldn't connect you to an agent at this time. Please try again later.</Say>
-  <Hangup/>
-</Response>'''
+            xml_content = TRANSFER_TWIML.substitute(number=escape(normalized_number))
         
-        logger.debug(f"Returning TwiML for transfer to {support_phone_number}")
+        logger.debug("Returning TwiML for transfer to {}", support_phone_number)
         return HTMLResponse(content=xml_content, media_type="application/xml")
     
     except Exception as e:
         logger.error(f"Error in transfer endpoint: {e}", exc_info=True)
         # Return error TwiML
-        error_xml = '''<?xml version="1.0" encoding="UTF-8"?>
-<Response>
-  <Say>I'm sorry, an error occurred during transfer. Please try again later.</Say>
-  <Hangup/>
-</Response>'''
-        return HTMLResponse(content=error_xml, media_type="application/xml")
+        return HTMLResponse(content=TRANSFER_ERROR_TWIML, media_type="application/xml")
 
 
 @app.get("/health")
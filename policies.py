@@ -4,6 +4,8 @@ This module implements a simple, deterministic policy engine.
 Missing rules default to deny (default-deny execution).
 """
 
+import functools
+from types import MappingProxyType
 from typing import Literal, Optional
 
 # Policy decision types
@@ -12,10 +14,23 @@ Intent = Literal["case_status", "escalate"]
 AuthLevel = Literal["weak", "strong", "any"]
 
 
-def evaluate_policy(intent: Intent, auth_level: AuthLevel) -> Decision:
+# Policy decision table, keyed by (intent, auth_level). An "any" auth level matches every
+# level, including a missing one. Combinations that aren't listed are denied (default-deny).
+POLICY_TABLE: MappingProxyType[tuple[Intent, Optional[AuthLevel]], Decision] = MappingProxyType({
+    ("case_status", "any"): "allow_status",
+    ("escalate", "strong"): "allow_escalate",
+})
+
+# Case number prefixes that get strong auth
+STRONG_AUTH_PREFIXES = ("VIP", "PRIORITY")
+# Only this many leading characters are uppercased for the prefix check
+STRONG_AUTH_PREFIX_LEN = max(len(prefix) for prefix in STRONG_AUTH_PREFIXES)
+
+
+def evaluate_policy(intent: Intent, auth_level: Optional[AuthLevel]) -> Decision:
     """Evaluate policy based on intent and auth level.
     
-    Policy rules:
+    Policy rules (see POLICY_TABLE):
     - case_status + any auth_level → allow_status
     - escalate + weak auth_level → deny
     - escalate + strong auth_level → allow_escalate
@@ -28,20 +43,13 @@ def evaluate_policy(intent: Intent, auth_level: AuthLevel) -> Decision:
     Returns:
         Decision: allow_status, allow_escalate, or deny
     """
-    # Policy decision table
-    if intent == "case_status":
-        return "allow_status"
-    
-    if intent == "escalate":
-        if auth_level == "strong":
-            return "allow_escalate"
-        elif auth_level == "weak":
-            return "deny"
-    
-    # Default-deny: missing rule or unknown combination
-    return "deny"
+    decision = POLICY_TABLE.get((intent, auth_level))
+    if decision is None:
+        decision = POLICY_TABLE.get((intent, "any"), "deny")
+    return decision
 
 
+@functools.lru_cache(maxsize=10_000)
 def get_auth_level(case_number: Optional[str]) -> AuthLevel:
     """Simulate authentication level based on case number.
     
@@ -49,7 +57,9 @@ def get_auth_level(case_number: Optional[str]) -> AuthLevel:
     - Cases starting with "VIP" or "PRIORITY" → strong
     - All others → weak
     
-    In production, this would query an auth service.
+    In production, this would query an auth service. Results are memoized per case
+    number, since every turn of a call asks again for the same case; a real auth
+    service would need a TTL on top so revocations are picked up.
     
     Args:
         case_number: The case number to check
@@ -60,8 +70,7 @@ def get_auth_level(case_number: Optional[str]) -> AuthLevel:
     if not case_number:
         return "weak"
     
-    case_upper = case_number.upper()
-    if case_upper.startswith("VIP") or case_upper.startswith("PRIORITY"):
+    if case_number[:STRONG_AUTH_PREFIX_LEN].upper().startswith(STRONG_AUTH_PREFIXES):
         return "strong"
     
     return "weak"
@@ -13,10 +13,9 @@ Extract one of the following intents:
 - escalate: User wants to escalate their case to a human agent
 
 Respond with ONLY a JSON object containing:
-{{
-    "intent": "case_status" | "escalate",
-    "confidence": 0.0-1.0
-}}
+{
+    "intent": "case_status" | "escalate"
+}
 
 Do not provide explanations, reasoning, or any other text. Only return the JSON object.
 """
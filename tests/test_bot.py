@@ -0,0 +1,43 @@
+"""Minimal unit tests for the voice pipeline's conversation bookkeeping."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# bot.py builds the Pipecat pipeline at import, so these tests need pipecat installed
+pytest.importorskip("pipecat")
+
+from pipecat.services.openai.tts import OpenAITTSService
+
+from bot import SharedClientOpenAITTSService, get_shared_openai_client, record_assistant_turn
+
+
+def test_assistant_turn_recorded_once():
+    """Each spoken assistant turn should appear in the history exactly once."""
+    messages = [{"role": "system", "content": "prompt"}]
+    assert record_assistant_turn(messages, "Hello!") is True
+    assert record_assistant_turn(messages, "Hello!") is False
+    assert messages.count({"role": "assistant", "content": "Hello!"}) == 1
+
+
+def test_repeated_answer_after_user_turn_recorded():
+    """The same answer given to a new user turn is a new assistant turn."""
+    messages = [{"role": "system", "content": "prompt"}]
+    record_assistant_turn(messages, "Your case is open.")
+    messages.append({"role": "user", "content": "What's my status again?"})
+    assert record_assistant_turn(messages, "Your case is open.") is True
+    assert [m["role"] for m in messages] == ["system", "assistant", "user", "assistant"]
+
+
+def test_tts_service_uses_shared_client():
+    """The TTS service should use the shared client and otherwise match a stock service."""
+    shared = SharedClientOpenAITTSService(api_key="test-key", voice="nova")
+    stock = OpenAITTSService(api_key="test-key", voice="nova")
+    assert shared._client is get_shared_openai_client("test-key", None)
+    assert shared._client is SharedClientOpenAITTSService(api_key="test-key")._client
+    assert vars(shared).keys() == vars(stock).keys()
+    assert shared.model_name == stock.model_name
@@ -13,6 +13,9 @@ def test_case_status_allowed():
     """Case status should be allowed for any auth level."""
     assert evaluate_policy("case_status", "weak") == "allow_status"
     assert evaluate_policy("case_status", "strong") == "allow_status"
+    assert evaluate_policy("case_status", "any") == "allow_status"
+    assert evaluate_policy("case_status", None) == "allow_status"
+    assert evaluate_policy("case_status", "unknown_level") == "allow_status"
 
 
 def test_escalate_weak_denied():
@@ -28,6 +31,8 @@ def test_escalate_strong_allowed():
 def test_default_deny():
     """Unknown combinations should default to deny."""
     assert evaluate_policy("unknown_intent", "weak") == "deny"
+    assert evaluate_policy("escalate", None) == "deny"
+    assert evaluate_policy("escalate", "unknown_level") == "deny"
 
 
 def test_auth_level_vip():
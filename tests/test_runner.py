@@ -1,12 +1,36 @@
 """Simple test runner - run with: python tests/test_runner.py or pytest tests/"""
 
+import inspect
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
+    from tests.test_case_extraction import (
+        test_extract_no_case_number,
+        test_extract_numeric_with_context,
+        test_extract_spoken_digits,
+        test_extract_spoken_vip,
+        test_extract_written_format,
+    )
+    from tests.test_graph import (
+        test_blank_input_skips_graph,
+        test_concurrent_extractions_share_llm_call,
+        test_intent_cache_ignores_failures,
+        test_intent_cache_skips_llm,
+        test_intent_llm_is_shared,
+        test_intent_retries_transient_failure,
+        test_keyword_fast_path,
+        test_keyword_fast_path_abstains_on_escalation_phrasing,
+        test_keyword_fast_path_falls_through,
+        test_keyword_fast_path_never_escalates,
+        test_run_graph_merges_parallel_branches,
+        test_status_lookup_cached,
+    )
     from tests.test_policies import (
         test_auth_level_priority,
         test_auth_level_regular,
@@ -32,6 +56,24 @@ try:
         test_get_case_status_existing,
         test_get_case_status_vip,
         test_get_case_status_unknown,
+        test_extract_written_format,
+        test_extract_numeric_with_context,
+        test_extract_spoken_digits,
+        test_extract_spoken_vip,
+        test_extract_no_case_number,
+        test_keyword_fast_path,
+        test_keyword_fast_path_abstains_on_escalation_phrasing,
+        test_keyword_fast_path_falls_through,
+        test_keyword_fast_path_never_escalates,
+        test_keyword_fast_path_abstains_on_escalation_phrasing,
+        test_intent_cache_skips_llm,
+        test_intent_cache_ignores_failures,
+        test_intent_retries_transient_failure,
+        test_concurrent_extractions_share_llm_call,
+        test_blank_input_skips_graph,
+        test_intent_llm_is_shared,
+        test_run_graph_merges_parallel_branches,
+        test_status_lookup_cached,
     ]
 except ImportError as e:
     print(f"Import error: {e}")
@@ -43,8 +85,13 @@ if __name__ == "__main__":
     failed = 0
     
     for test in TESTS:
+        # Tests that patch module state take pytest's monkeypatch, undone after each test
+        monkeypatch = pytest.MonkeyPatch()
         try:
-            test()
+            if "monkeypatch" in inspect.signature(test).parameters:
+                test(monkeypatch)
+            else:
+                test()
             print(f"✓ {test.__name__}")
             passed += 1
         except AssertionError as e:
@@ -53,6 +100,8 @@ if __name__ == "__main__":
         except Exception as e:
             print(f"✗ {test.__name__}: {type(e).__name__}: {e}")
             failed += 1
+        finally:
+            monkeypatch.undo()
     
     print(f"\n{passed} passed, {failed} failed")
     sys.exit(1 if failed > 0 else 0)
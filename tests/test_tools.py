@@ -21,6 +21,8 @@ def test_get_case_status_vip():
     status = get_case_status("VIP-001")
     assert status["case_number"] == "VIP-001"
     assert status["status"] == "in_progress"
+    assert get_case_status("vip001")["case_number"] == "VIP-001"
+    assert get_case_status(" vip-001 ")["case_number"] == "VIP-001"
 
 
 def test_get_case_status_unknown():
@@ -4,19 +4,42 @@ This module contains all backend actions that have side effects.
 These tools are ONLY accessible through explicit LangGraph routing.
 """
 
+import functools
 import os
 import re
-from typing import Optional
+from string import Template
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Optional
+from xml.sax.saxutils import escape
 
 from loguru import logger
-from twilio.rest import Client
 
+if TYPE_CHECKING:
+    from twilio.rest import Client
 
+
+class _DeleteMissing(dict):
+    """str.translate table that deletes every character it has no entry for."""
+
+    def __missing__(self, codepoint: int) -> None:
+        return None
+
+
+# Keeps ASCII digits and "+" and deletes everything else when normalizing phone numbers
+PHONE_NUMBER_KEEP_TABLE = _DeleteMissing({ord(char): ord(char) for char in "0123456789+"})
+
+# Letter-prefixed case numbers with or without the dash ("VIP001", "VIP-001"), matched
+# against uppercased text and normalized to the dashed form for lookup
+PREFIXED_CASE_PATTERN = re.compile(r'([A-Z]+)-?(\d+)')
+
+
+@functools.lru_cache(maxsize=1)
 def get_base_url() -> str:
     """Get the base URL for TwiML endpoints.
     
     Uses BASE_URL environment variable if set, otherwise defaults to localhost.
-    In production, this should be set to your public URL.
+    In production, this should be set to your public URL. Resolved once, on first
+    use (after the server has loaded .env), and reused afterwards.
     """
     base_url = os.getenv("BASE_URL")
     if base_url:
@@ -37,8 +60,12 @@ def normalize_phone_number(phone_number: str) -> str:
     if not phone_number:
         return phone_number
     
+    # Already E.164 (the usual SUPPORT_PHONE_NUMBER format): nothing to clean
+    if phone_number.startswith('+') and phone_number.isascii() and phone_number[1:].isdigit():
+        return phone_number
+    
     # Remove all non-digit characters except +
-    cleaned = re.sub(r'[^\d+]', '', phone_number)
+    cleaned = phone_number.translate(PHONE_NUMBER_KEEP_TABLE)
     
     # If it already starts with +, assume it's already in E.164 format
     if cleaned.startswith('+'):
@@ -55,7 +82,7 @@ def normalize_phone_number(phone_number: str) -> str:
     # If it's already 11 digits with +1, return as-is (shouldn't happen after cleaning)
     # Otherwise, log warning and return with + prefix
     if len(cleaned) > 11:
-        logger.warning(f"Phone number {phone_number} has unusual length after cleaning: {cleaned}")
+        logger.warning("Phone number {} has unusual length after cleaning: {}", phone_number, cleaned)
     
     # Try to add +1 if it looks like a US number
     if cleaned.isdigit() and len(cleaned) >= 10:
@@ -65,27 +92,110 @@ def normalize_phone_number(phone_number: str) -> str:
     
     # Fallback: return with + prefix if it doesn't have one
     if not cleaned.startswith('+'):
-        logger.warning(f"Could not normalize phone number {phone_number}, using as-is: {cleaned}")
+        logger.warning("Could not normalize phone number {}, using as-is: {}", phone_number, cleaned)
         return f"+{cleaned}" if cleaned else phone_number
     
     return cleaned
 
+# Upper bound on a Twilio REST call, so a slow API can't hold an escalating caller indefinitely
+TWILIO_HTTP_TIMEOUT_SECONDS = 5.0
+
 # Initialize Twilio client
-_twilio_client: Optional[Client] = None
+_twilio_client: Optional["Client"] = None
 
 
-def get_twilio_client() -> Client:
-    """Get or create Twilio client."""
+def get_twilio_client() -> "Client":
+    """Get or create Twilio client.
+    
+    The Twilio SDK is imported on first use, so calls that never escalate don't load it.
+    The client is kept for the life of the process; its HTTP client holds a pooled
+    keep-alive session, so later escalations skip the TLS handshake with api.twilio.com.
+    """
     global _twilio_client
     if _twilio_client is None:
+        from twilio.http.http_client import TwilioHttpClient
+        from twilio.rest import Client
+        
         account_sid = os.getenv("TWILIO_ACCOUNT_SID")
         auth_token = os.getenv("TWILIO_AUTH_TOKEN")
         if not account_sid or not auth_token:
             raise ValueError("TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN must be set")
-        _twilio_client = Client(account_sid, auth_token)
+        _twilio_client = Client(
+            account_sid,
+            auth_token,
+            http_client=TwilioHttpClient(timeout=TWILIO_HTTP_TIMEOUT_SECONDS),
+        )
     return _twilio_client
 
 
+def warm_up_twilio_client() -> None:
+    """Import the Twilio SDK and create the client before the first escalation.
+    
+    No request is made: an idle connection opened at startup would be closed long
+    before the first caller escalates, and a blocking fetch would stall startup.
+    """
+    try:
+        get_twilio_client()
+    except ValueError:
+        # Missing credentials are already reported at startup; escalation will fail cleanly
+        pass
+
+
+# Mock case statuses for PoC, built once rather than on every lookup
+# In production, this would query a real database/API
+MOCK_CASE_STATUSES = MappingProxyType({
+    "12345": {
+        "case_number": "12345",
+        "status": "open",
+        "reason": "Awaiting customer response",
+        "opened_date": "2024-01-15",
+        "last_updated": "2024-01-20"
+    },
+    "VIP-001": {
+        "case_number": "VIP-001",
+        "status": "in_progress",
+        "reason": "Technical review in progress",
+        "opened_date": "2024-01-10",
+        "last_updated": "2024-01-22"
+    }
+})
+
+# Returned (with the requested case number filled in) for unknown cases
+UNKNOWN_CASE_STATUS = MappingProxyType({
+    "status": "unknown",
+    "reason": "Case not found in system",
+    "opened_date": "unknown",
+    "last_updated": "unknown"
+})
+
+
+def normalize_case_key(case_number: str) -> str:
+    """Normalize a case number for lookup: trimmed, uppercase, dash after a letter prefix."""
+    # strip() returns the same string when there's nothing to trim; upper() always copies,
+    # so it's skipped for keys that are already uppercase or all digits
+    key = case_number.strip()
+    if not (key.isupper() or key.isdigit()):
+        key = key.upper()
+    prefixed_match = PREFIXED_CASE_PATTERN.fullmatch(key)
+    if prefixed_match:
+        return f"{prefixed_match.group(1)}-{prefixed_match.group(2)}"
+    return key
+
+
+# MOCK_CASE_STATUSES keys by their normalized form, so any spelling resolves in one lookup
+MOCK_CASE_KEYS = MappingProxyType({normalize_case_key(key): key for key in MOCK_CASE_STATUSES})
+
+
+@functools.lru_cache(maxsize=1024)
+def resolve_mock_case_key(case_number: str) -> Optional[str]:
+    """Find the MOCK_CASE_STATUSES key for a case number, or None if it isn't there.
+    
+    Handles "VIP001", "vip-001" and stray whitespace. The table is frozen, so the answer
+    for a given case number never changes and repeated lookups skip the normalization.
+    """
+    return MOCK_CASE_KEYS.get(normalize_case_key(case_number))
+
+
 def get_case_status(case_number: str) -> dict:
     """Get case status (read-only operation).
     
@@ -98,56 +208,35 @@ def get_case_status(case_number: str) -> dict:
     Returns:
         dict: Case status information
     """
-    logger.info(f"Looking up case status for case: {case_number}")
-    
-    # Mock case status for PoC
-    # In production, this would query a real database/API
-    mock_statuses = {
-        "12345": {
-            "case_number": "12345",
-            "status": "open",
-            "reason": "Awaiting customer response",
-            "opened_date": "2024-01-15",
-            "last_updated": "2024-01-20"
-        },
-        "VIP-001": {
-            "case_number": "VIP-001",
-            "status": "in_progress",
-            "reason": "Technical review in progress",
-            "opened_date": "2024-01-10",
-            "last_updated": "2024-01-22"
-        }
-    }
+    logger.info("Looking up case status for case: {}", case_number)
     
-    # Normalize case number for lookup (handle both VIP-001 and VIP001 formats)
-    # Try exact match first
-    status = mock_statuses.get(case_number)
-    
-    if not status:
-        # Try normalized version (VIP001 -> VIP-001)
-        normalized_case = case_number
-        if case_number.upper().startswith("VIP") and "-" not in case_number:
-            # Convert VIP001 to VIP-001 for lookup
-            vip_match = re.match(r'(VIP)(\d+)', case_number.upper())
-            if vip_match:
-                normalized_case = f"{vip_match.group(1)}-{vip_match.group(2)}"
-        
-        status = mock_statuses.get(normalized_case)
+    mock_key = resolve_mock_case_key(case_number)
     
+    # Copy so callers can't modify the shared mock data
+    if mock_key:
+        status = dict(MOCK_CASE_STATUSES[mock_key])
     # If still not found, return default
-    if not status:
-        status = {
-            "case_number": case_number,
-            "status": "unknown",
-            "reason": "Case not found in system",
-            "opened_date": "unknown",
-            "last_updated": "unknown"
-        }
-    
-    logger.info(f"Case status retrieved: {status}")
+    else:
+        status = {"case_number": case_number, **UNKNOWN_CASE_STATUS}
+    
+    logger.debug("Case status retrieved: {}", status)
     return status
 
 
+# Transfer TwiML sent to Twilio when forwarding a call; only the dialed number varies
+TRANSFER_TWIML = Template("""<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    <Say>Connecting you to one of our agents now. Please hold.</Say>
+    <Dial>$number</Dial>
+</Response>""")
+
+
+@functools.lru_cache(maxsize=16)
+def build_transfer_twiml(support_phone_number: str) -> str:
+    """Build the transfer TwiML for a number; calls are routed to only a few numbers."""
+    return TRANSFER_TWIML.substitute(number=escape(support_phone_number))
+
+
 def forward_call_to_agent(call_sid: str, support_phone_number: str) -> bool:
     """Forward a Twilio call to a human agent using TwiML Dial verb"""
     if not call_sid:
@@ -158,18 +247,24 @@ def forward_call_to_agent(call_sid: str, support_phone_number: str) -> bool:
         logger.error("Cannot forward call: SUPPORT_PHONE_NUMBER is not configured")
         return False
     
+    # Imported here, like the client itself, so only escalating calls load the Twilio SDK
+    from twilio.base.exceptions import TwilioRestException
+    
     try:
         client = get_twilio_client()
-        twiml = f"""<?xml version="1.0" encoding="UTF-8"?>
-<Response>
-    <Say>Connecting you to one of our agents now. Please hold.</Say>
-    <Dial>{support_phone_number}</Dial>
-</Response>"""
+        twiml = build_transfer_twiml(support_phone_number)
         
-        call = client.calls(call_sid).update(twiml=twiml)
-        logger.info(f"Call {call_sid} forwarded to {support_phone_number}")
+        client.calls(call_sid).update(twiml=twiml)
+        logger.info("Call {} forwarded to {}", call_sid, support_phone_number)
         return True
+    except TwilioRestException as e:
+        # Expected failures (call already ended, unknown SID): Twilio's status and error
+        # code say everything, so no traceback is needed
+        logger.warning(
+            "Twilio rejected transfer of call {} (HTTP {}, code {}): {}",
+            call_sid, e.status, e.code, e.msg,
+        )
+        return False
     except Exception as e:
-        logger.error(f"Error forwarding call {call_sid} to {support_phone_number}: {e}")
+        logger.error("Error forwarding call {} to {}: {}", call_sid, support_phone_number, e)
         return False
-